@@ -0,0 +1,56 @@
+import asyncio
+import io
+import os
+
+import orjson
+import pytest
+
+os.environ.setdefault("SERVE_STATIC", "false")
+
+from app import extract_bot_response, stream_bot_response
+
+
+class BytesReader:
+    """Async file-like reader over a bytes body, fed to ijson in small chunks."""
+    def __init__(self, body: bytes):
+        self.body = io.BytesIO(body)
+
+    async def read(self, size: int = -1) -> bytes:
+        # Honour read(0): ijson uses it to check whether the stream yields bytes
+        return self.body.read(16 if size < 0 or size > 16 else size)
+
+
+def langflow_body(*results):
+    """Wrap results objects in the outputs[*].outputs[*].results structure."""
+    return {
+        "session_id": "s",
+        "outputs": [{"inputs": {}, "outputs": [{"results": r, "artifacts": {}} for r in results]}]
+    }
+
+
+@pytest.mark.parametrize("data, expected", [
+    # message.text wins over text regardless of key order
+    (langflow_body({"text": "A", "message": {"text": "B"}}), "B"),
+    (langflow_body({"message": {"text": "B"}, "text": "A"}), "B"),
+    # a message string wins over text
+    (langflow_body({"text": "T", "message": "M"}), "M"),
+    # empty strings are skipped
+    (langflow_body({"message": {"text": ""}, "text": "T"}), "T"),
+    (langflow_body({"message": "", "text": ""}, {"message": "M"}), "M"),
+    # a results object that is itself a string
+    (langflow_body("R"), "R"),
+    (langflow_body("", "R"), "R"),
+    # the first results object holding a reply wins over later ones
+    (langflow_body({}, {"text": "X"}), "X"),
+    (langflow_body({"message": "first"}, {"message": {"text": "second"}}), "first"),
+])
+def test_stream_and_full_parse_agree(data, expected):
+    body = orjson.dumps(data)
+    assert asyncio.run(stream_bot_response(BytesReader(body))) == expected
+    assert extract_bot_response(orjson.loads(body)) == expected
+
+
+def test_stream_leaves_generic_text_to_full_parse():
+    body = orjson.dumps({"outputs": [{"outputs": [{"results": {}}]}], "content": "C"})
+    assert asyncio.run(stream_bot_response(BytesReader(body))) is None
+    assert extract_bot_response(orjson.loads(body)) == "C"